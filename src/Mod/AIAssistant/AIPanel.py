@@ -3,6 +3,8 @@
 AI Assistant Panel - Main dock widget for natural language CAD modeling.
 """
 
+import threading
+
 import FreeCAD
 import FreeCADGui
 from PySide6 import QtWidgets, QtCore, QtGui
@@ -12,9 +14,90 @@ from . import ContextBuilder
 from . import CodeExecutor
 
 
+# Stylesheet for the static panel widgets, set once on the panel's main widget.
+# Rules are scoped by objectName so Qt parses a single sheet for the whole panel.
+_PANEL_QSS = """
+    QLabel#AIAssistantTitle {
+        font-weight: bold;
+        font-size: 13px;
+    }
+    QTextEdit#AIAssistantChat {
+        background-color: #1e1e1e;
+        color: #d4d4d4;
+        border: 1px solid #3c3c3c;
+        border-radius: 4px;
+        font-family: sans-serif;
+        font-size: 12px;
+    }
+    QPlainTextEdit#AIAssistantCode {
+        font-family: monospace;
+        font-size: 11px;
+        background-color: #2d2d2d;
+        color: #9cdcfe;
+        border: 1px solid #3c3c3c;
+        border-radius: 4px;
+    }
+    QLineEdit#AIAssistantInput {
+        padding: 6px;
+    }
+    QPushButton#AIAssistantSend {
+        padding: 6px 16px;
+    }
+    QPushButton#AIAssistantRun {
+        padding: 6px 16px;
+        background-color: #4CAF50;
+        color: white;
+        border: none;
+        border-radius: 4px;
+    }
+    QPushButton#AIAssistantRun:disabled {
+        background-color: #cccccc;
+    }
+    QPushButton#AIAssistantRun:hover:!disabled {
+        background-color: #45a049;
+    }
+    QPushButton#AIAssistantClear {
+        padding: 6px 12px;
+    }
+"""
+
+# Upper bound on chat display paragraphs (a message takes two or more)
+_MAX_CHAT_BLOCKS = 1000
+
+_STATUS_QSS = "color: palette(mid); font-size: 11px;"
+_STATUS_OK_QSS = "color: #4CAF50; font-size: 11px;"
+_STATUS_ERROR_QSS = "color: #f44336; font-size: 11px;"
+
+# Chat label colors by message role
+_ROLE_COLORS = {
+    "You": "#61afef",  # Blue
+    "AI": "#98c379",  # Green
+    "Error": "#e06c75",  # Red
+}
+_DEFAULT_ROLE_COLOR = "#abb2bf"  # Gray for System
+
+
+def _role_header(role: str, color: str = _DEFAULT_ROLE_COLOR) -> str:
+    """Render the bold, colored "Role:" label shown above a chat message."""
+    return f'<span style="color: {color}; font-weight: bold;">{role}:</span>'
+
+
+# Pre-rendered labels for the roles the panel uses
+_ROLE_HEADERS = {role: _role_header(role, color) for role, color in _ROLE_COLORS.items()}
+_ROLE_HEADERS["System"] = _role_header("System")
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, marking the cut with '...'."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
 class AIAssistantDockWidget(QtWidgets.QDockWidget):
     """Main AI Assistant dock widget."""
 
+    # Emitted from a request thread, queued to the GUI thread: (request_id, user_input, response)
+    _responseReady = QtCore.Signal(int, str, str)
+
     def __init__(self, parent=None):
         super().__init__("AI Assistant", parent)
         self.setObjectName("AIAssistantPanel")
@@ -24,6 +107,8 @@ class AIAssistantDockWidget(QtWidgets.QDockWidget):
 
         self.llm = LLMBackend.LLMBackend()
         self.conversation = []
+        # Id of the request whose reply is awaited; bumped by Clear to drop stale replies
+        self._request_id = 0
 
         self._setup_ui()
         self._connect_signals()
@@ -31,6 +116,7 @@ class AIAssistantDockWidget(QtWidgets.QDockWidget):
     def _setup_ui(self):
         """Build the UI."""
         main = QtWidgets.QWidget()
+        main.setStyleSheet(_PANEL_QSS)
         layout = QtWidgets.QVBoxLayout(main)
         layout.setContentsMargins(8, 8, 8, 8)
         layout.setSpacing(6)
@@ -38,9 +124,10 @@ class AIAssistantDockWidget(QtWidgets.QDockWidget):
         # Header
         header = QtWidgets.QHBoxLayout()
         title = QtWidgets.QLabel("AI Assistant")
-        title.setStyleSheet("font-weight: bold; font-size: 13px;")
+        title.setObjectName("AIAssistantTitle")
+        # Let the title take the spare width instead of adding a spacer item
+        title.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Preferred)
         header.addWidget(title)
-        header.addStretch()
 
         self.settings_btn = QtWidgets.QToolButton()
         self.settings_btn.setText("...")
@@ -54,16 +141,9 @@ class AIAssistantDockWidget(QtWidgets.QDockWidget):
         self.chat_display = QtWidgets.QTextEdit()
         self.chat_display.setReadOnly(True)
         self.chat_display.setMinimumHeight(150)
-        self.chat_display.setStyleSheet("""
-            QTextEdit {
-                background-color: #1e1e1e;
-                color: #d4d4d4;
-                border: 1px solid #3c3c3c;
-                border-radius: 4px;
-                font-family: sans-serif;
-                font-size: 12px;
-            }
-        """)
+        # Drop the oldest blocks instead of letting a long session grow the document
+        self.chat_display.document().setMaximumBlockCount(_MAX_CHAT_BLOCKS)
+        self.chat_display.setObjectName("AIAssistantChat")
         layout.addWidget(self.chat_display, stretch=2)
 
         # Code preview
@@ -77,16 +157,7 @@ class AIAssistantDockWidget(QtWidgets.QDockWidget):
 
         self.code_display = QtWidgets.QPlainTextEdit()
         self.code_display.setMinimumHeight(80)
-        self.code_display.setStyleSheet("""
-            QPlainTextEdit {
-                font-family: monospace;
-                font-size: 11px;
-                background-color: #2d2d2d;
-                color: #9cdcfe;
-                border: 1px solid #3c3c3c;
-                border-radius: 4px;
-            }
-        """)
+        self.code_display.setObjectName("AIAssistantCode")
         layout.addWidget(self.code_display, stretch=1)
 
         # Input area
@@ -95,46 +166,38 @@ class AIAssistantDockWidget(QtWidgets.QDockWidget):
 
         self.input_field = QtWidgets.QLineEdit()
         self.input_field.setPlaceholderText("e.g., Create a box with a hole in the center...")
-        self.input_field.setStyleSheet("padding: 6px;")
+        self.input_field.setObjectName("AIAssistantInput")
         layout.addWidget(self.input_field)
 
         # Buttons
         btn_layout = QtWidgets.QHBoxLayout()
 
         self.send_btn = QtWidgets.QPushButton("Send")
-        self.send_btn.setStyleSheet("padding: 6px 16px;")
+        self.send_btn.setObjectName("AIAssistantSend")
         btn_layout.addWidget(self.send_btn)
 
         self.run_btn = QtWidgets.QPushButton("Run Code")
         self.run_btn.setEnabled(False)
-        self.run_btn.setStyleSheet("""
-            QPushButton {
-                padding: 6px 16px;
-                background-color: #4CAF50;
-                color: white;
-                border: none;
-                border-radius: 4px;
-            }
-            QPushButton:disabled {
-                background-color: #cccccc;
-            }
-            QPushButton:hover:!disabled {
-                background-color: #45a049;
-            }
-        """)
+        self.run_btn.setObjectName("AIAssistantRun")
         btn_layout.addWidget(self.run_btn)
 
         self.clear_btn = QtWidgets.QPushButton("Clear")
-        self.clear_btn.setStyleSheet("padding: 6px 12px;")
+        self.clear_btn.setObjectName("AIAssistantClear")
         btn_layout.addWidget(self.clear_btn)
 
         layout.addLayout(btn_layout)
 
         # Status bar
         self.status = QtWidgets.QLabel("Ready")
-        self.status.setStyleSheet("color: palette(mid); font-size: 11px;")
+        self.status.setStyleSheet(_STATUS_QSS)
         layout.addWidget(self.status)
 
+        # Restores the status color some time after a run; restarted by each run
+        self._status_timer = QtCore.QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(3000)
+        self._status_timer.setTimerType(QtCore.Qt.VeryCoarseTimer)
+
         self.setWidget(main)
         self.setMinimumWidth(320)
 
@@ -163,40 +226,28 @@ class AIAssistantDockWidget(QtWidgets.QDockWidget):
         self.send_btn.clicked.connect(self._on_send)
         self.run_btn.clicked.connect(self._on_run)
         self.clear_btn.clicked.connect(self._on_clear)
+        self._status_timer.timeout.connect(self._reset_status_style)
+        self._responseReady.connect(self._on_response, QtCore.Qt.QueuedConnection)
 
     def _append_message(self, role: str, content: str, is_code: bool = False):
         """Append a message to the chat display."""
-        if role == "You":
-            color = "#61afef"  # Blue
-        elif role == "AI":
-            color = "#98c379"  # Green
-        elif role == "Error":
-            color = "#e06c75"  # Red
-        else:
-            color = "#abb2bf"  # Gray for System
-
-        self.chat_display.append(
-            f'<span style="color: {color}; font-weight: bold;">{role}:</span>'
-        )
+        header = _ROLE_HEADERS.get(role) or _role_header(role)
         if is_code:
-            preview = content[:100] + "..." if len(content) > 100 else content
+            preview = _truncate(content, 100)
             escaped = preview.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-            self.chat_display.append(
-                f'<pre style="margin: 2px 0 8px 0; color: #abb2bf;">{escaped}</pre>'
-            )
+            body = f'<pre style="margin: 2px 0 8px 0; color: #abb2bf;">{escaped}</pre>'
         else:
-            self.chat_display.append(
-                f'<p style="margin: 2px 0 8px 0; color: #d4d4d4;">{content}</p>'
-            )
+            body = f'<p style="margin: 2px 0 8px 0; color: #d4d4d4;">{content}</p>'
 
-        # Scroll to bottom
-        scrollbar = self.chat_display.verticalScrollBar()
-        scrollbar.setValue(scrollbar.maximum())
+        # Label and body go in with one append so the document is laid out once.
+        # No explicit scrolling: on a read-only QTextEdit, append() keeps the view
+        # pinned to the bottom if it was at the bottom before
+        self.chat_display.append(header + body)
 
     def _on_send(self):
         """Handle send button click."""
         user_input = self.input_field.text().strip()
-        if not user_input:
+        if not user_input or not self.send_btn.isEnabled():
             return
 
         self.input_field.clear()
@@ -205,23 +256,38 @@ class AIAssistantDockWidget(QtWidgets.QDockWidget):
         # Update UI state
         self.status.setText("Thinking...")
         self.send_btn.setEnabled(False)
-        QtWidgets.QApplication.processEvents()
 
-        # Build context if enabled
+        # Build context if enabled (document access must stay on the GUI thread)
         context = ""
         if self.context_action.isChecked():
             context = ContextBuilder.build_context()
 
-        # Call LLM
-        response = self.llm.chat(user_input, context, self.conversation)
+        # Call LLM on a daemon thread, so a pending request never holds up exit;
+        # pass a snapshot of the history
+        self._request_id += 1
+        threading.Thread(
+            target=self._request,
+            args=(self._request_id, user_input, context, list(self.conversation)),
+            daemon=True,
+        ).start()
+
+    def _request(self, request_id, user_input, context, history):
+        """Call the backend off the GUI thread and queue the reply back to it."""
+        response = self.llm.chat(user_input, context, history)
+        self._responseReady.emit(request_id, user_input, response)
+
+    def _on_response(self, request_id: int, user_input: str, response: str):
+        """Handle a reply from a request thread."""
+        # Sent before the chat was cleared; nothing is waiting for it any more
+        if request_id != self._request_id:
+            return
 
         # Update conversation history
         self.conversation.append({"role": "user", "content": user_input})
         self.conversation.append({"role": "assistant", "content": response})
 
-        # Keep only last 10 exchanges
-        if len(self.conversation) > 20:
-            self.conversation = self.conversation[-20:]
+        # Only the tail is ever sent to the backend, so don't keep more than that
+        del self.conversation[: -LLMBackend.MAX_HISTORY_MESSAGES]
 
         # Display response
         self._append_message("AI", response, is_code=True)
@@ -247,24 +313,27 @@ class AIAssistantDockWidget(QtWidgets.QDockWidget):
 
         if success:
             self.status.setText("Executed successfully")
-            self.status.setStyleSheet("color: #4CAF50; font-size: 11px;")
+            self.status.setStyleSheet(_STATUS_OK_QSS)
             self._append_message("System", "Code executed successfully")
         else:
-            self.status.setText(f"Error: {message[:50]}")
-            self.status.setStyleSheet("color: #f44336; font-size: 11px;")
+            self.status.setText(f"Error: {_truncate(message, 50)}")
+            self.status.setStyleSheet(_STATUS_ERROR_QSS)
             self._append_message("Error", message)
 
         # Reset status color after delay
-        QtCore.QTimer.singleShot(3000, self._reset_status_style)
+        self._status_timer.start()
 
     def _reset_status_style(self):
-        self.status.setStyleSheet("color: palette(mid); font-size: 11px;")
+        self.status.setStyleSheet(_STATUS_QSS)
 
     def _on_clear(self):
         """Clear the UI."""
+        # Drop the reply to any request still in flight
+        self._request_id += 1
         self.chat_display.clear()
         self.code_display.clear()
         self.run_btn.setEnabled(False)
+        self.send_btn.setEnabled(True)
         self.status.setText("Ready")
         self._reset_status_style()
 
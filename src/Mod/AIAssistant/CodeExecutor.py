@@ -3,11 +3,13 @@
 Code Executor - Safely executes AI-generated Python code in FreeCAD.
 """
 
+import importlib
+
 import FreeCAD
 import FreeCADGui
 
 # Patterns that might indicate dangerous operations
-BLOCKED_PATTERNS = [
+BLOCKED_PATTERNS = (
     "os.system",
     "subprocess",
     "shutil.rmtree",
@@ -21,7 +23,10 @@ BLOCKED_PATTERNS = [
     "requests.",
     "urllib.",
     "socket.",
-]
+)
+
+# BLOCKED_PATTERNS lowercased once, to match against the lowercased code
+_BLOCKED_PATTERNS_LOWER = tuple(pattern.lower() for pattern in BLOCKED_PATTERNS)
 
 
 def execute(code: str) -> tuple:
@@ -82,14 +87,15 @@ def _clean_code(code: str) -> str:
     """Clean up code - remove markdown formatting if present."""
     code = code.strip()
 
-    # Remove markdown code fences
-    lines = code.split("\n")
-    if lines and lines[0].startswith("```"):
-        lines = lines[1:]
-    if lines and lines[-1].strip() == "```":
-        lines = lines[:-1]
+    # Remove markdown code fences; only the first and last lines can hold one
+    if code.startswith("```"):
+        first_end = code.find("\n")
+        code = code[first_end + 1 :] if first_end != -1 else ""
+    last_start = code.rfind("\n") + 1
+    if code[last_start:].strip() == "```":
+        code = code[: max(last_start - 1, 0)]
 
-    return "\n".join(lines).strip()
+    return code.strip()
 
 
 def _safety_check(code: str) -> str:
@@ -101,13 +107,26 @@ def _safety_check(code: str) -> str:
     """
     code_lower = code.lower()
 
-    for pattern in BLOCKED_PATTERNS:
-        if pattern.lower() in code_lower:
+    for pattern, pattern_lower in zip(BLOCKED_PATTERNS, _BLOCKED_PATTERNS_LOWER):
+        if pattern_lower in code_lower:
             return f"Blocked potentially dangerous operation: {pattern}"
 
     return ""
 
 
+# Modules exposed to generated code: namespace name -> module to import
+_NAMESPACE_MODULES = (
+    ("Part", "Part"),
+    ("Draft", "Draft"),
+    ("Arch", "Arch"),
+    ("Sketcher", "Sketcher"),
+    ("PartDesign", "PartDesign"),
+    ("Mesh", "Mesh"),
+    ("BIM", "BIM"),
+    ("ArchPrecast", "BIM.ArchPrecast"),
+)
+
+
 def _build_namespace() -> dict:
     """Build the execution namespace with FreeCAD modules."""
     namespace = {
@@ -117,36 +136,13 @@ def _build_namespace() -> dict:
         "Gui": FreeCADGui,
     }
 
-    # Import common modules
-    modules_to_import = [
-        "Part",
-        "Draft",
-        "Arch",
-        "Sketcher",
-        "PartDesign",
-        "Mesh",
-    ]
-
-    for mod_name in modules_to_import:
+    # Skip modules that aren't available
+    for name, module_name in _NAMESPACE_MODULES:
         try:
-            namespace[mod_name] = __import__(mod_name)
+            namespace[name] = importlib.import_module(module_name)
         except ImportError:
             pass
 
-    # Try to import BIM module
-    try:
-        import BIM
-        namespace["BIM"] = BIM
-    except ImportError:
-        pass
-
-    # Try to import BIM.ArchPrecast
-    try:
-        from BIM import ArchPrecast
-        namespace["ArchPrecast"] = ArchPrecast
-    except ImportError:
-        pass
-
     return namespace
 
 
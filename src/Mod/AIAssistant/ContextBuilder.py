@@ -26,15 +26,16 @@ def build_context() -> str:
 
     # List objects
     objects = doc.Objects
-    if not objects:
+    count = len(objects)
+    if not count:
         lines.append("Document is empty.")
     else:
-        lines.append(f"\nObjects ({len(objects)}):")
+        lines.append(f"\nObjects ({count}):")
         for obj in objects[:15]:  # Limit to avoid huge context
             lines.append(_describe_object(obj))
 
-        if len(objects) > 15:
-            lines.append(f"  ... and {len(objects) - 15} more objects")
+        if count > 15:
+            lines.append(f"  ... and {count - 15} more objects")
 
     # Selection info
     try:
@@ -13,6 +13,9 @@ import FreeCAD
 DEFAULT_API_URL = "http://20.64.149.209/chat/completions"
 DEFAULT_MODEL = "sonnet"
 
+# Number of previous messages (user + assistant) sent along with a request
+MAX_HISTORY_MESSAGES = 6
+
 SYSTEM_PROMPT = """You are an AI assistant integrated into FreeCAD, a parametric 3D CAD modeler.
 Your task is to convert natural language requests into executable FreeCAD Python code.
 
@@ -150,7 +153,7 @@ class LLMBackend:
 
         # Add conversation history (last few exchanges)
         if history:
-            messages.extend(history[-6:])  # Last 3 exchanges
+            messages.extend(history[-MAX_HISTORY_MESSAGES:])
 
         # Add current message
         messages.append({"role": "user", "content": user_message})
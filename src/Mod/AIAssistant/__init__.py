@@ -12,6 +12,8 @@ Usage:
     Or press Ctrl+Shift+A
 """
 
+import FreeCAD
+
 __version__ = "0.1.0"
 
 _panel = None
@@ -20,10 +22,8 @@ _panel = None
 def show():
     """Show the AI Assistant panel."""
     global _panel
-    import FreeCAD
     import FreeCADGui
     from PySide6 import QtCore
-    from . import AIPanel
 
     mw = FreeCADGui.getMainWindow()
     if mw is None:
@@ -31,7 +31,16 @@ def show():
         return None
 
     if _panel is None:
-        _panel = AIPanel.AIAssistantDockWidget()
+        try:
+            from . import AIPanel
+
+            _panel = AIPanel.AIAssistantDockWidget()
+        except Exception as e:
+            FreeCAD.Console.PrintError(f"AIAssistant error: {e}\n")
+            import traceback
+
+            traceback.print_exc()
+            return None
         _panel.setObjectName("AIAssistantDockWidget")
         mw.addDockWidget(QtCore.Qt.RightDockWidgetArea, _panel)
 